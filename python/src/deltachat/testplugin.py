@@ -165,6 +165,9 @@ def acfactory(pytestconfig, tmpdir, request, session_liveconfig, data):
             self.offline_count = 0
             self._finalizers = []
             self.init_time = time.time()
+            # total time the acfactory helpers wait for online account
+            # configuration, kept below the pytest-timeout from tox.ini
+            self.configure_timeout = 60
             self._generated_keys = ["alice", "bob", "charlie",
                                     "dom", "elena", "fiona"]
 
@@ -176,7 +179,6 @@ def acfactory(pytestconfig, tmpdir, request, session_liveconfig, data):
         def make_account(self, path, logid, quiet=False):
             ac = Account(path)
             ac._evtracker = ac.add_account_plugin(FFIEventTracker(ac))
-            ac._configtracker = ac.add_account_plugin(ConfigureTracker())
             if not quiet:
                 ac.add_account_plugin(FFIEventLogger(ac, logid=logid))
             self._finalizers.append(ac.shutdown)
@@ -229,6 +231,7 @@ def acfactory(pytestconfig, tmpdir, request, session_liveconfig, data):
 
             tmpdb = tmpdir.join("livedb%d" % self.live_count)
             ac = self.make_account(tmpdb.strpath, logid="ac{}".format(self.live_count), quiet=quiet)
+            ac._configtracker = ac.add_account_plugin(ConfigureTracker())
             if pre_generated_key:
                 self._preconfigure_key(ac, configdict['addr'])
             ac._evtracker.init_time = self.init_time
@@ -250,22 +253,25 @@ def acfactory(pytestconfig, tmpdir, request, session_liveconfig, data):
         def get_one_online_account(self, pre_generated_key=True, mvbox=False, move=False):
             ac1 = self.get_online_configuring_account(
                 pre_generated_key=pre_generated_key, mvbox=mvbox, move=move)
-            ac1._configtracker.wait_imap_connected()
-            ac1._configtracker.wait_smtp_connected()
-            ac1._configtracker.wait_finish()
+            deadline = time.monotonic() + self.configure_timeout
+            ac1._configtracker.wait_imap_connected(timeout=deadline - time.monotonic())
+            ac1._configtracker.wait_smtp_connected(timeout=deadline - time.monotonic())
+            ac1._configtracker.wait_finish(timeout=deadline - time.monotonic())
             return ac1
 
         def get_two_online_accounts(self, move=False, quiet=False):
             ac1 = self.get_online_configuring_account(move=True, quiet=quiet)
             ac2 = self.get_online_configuring_account(quiet=quiet)
-            ac1._configtracker.wait_finish()
-            ac2._configtracker.wait_finish()
+            deadline = time.monotonic() + self.configure_timeout
+            ac1._configtracker.wait_finish(timeout=deadline - time.monotonic())
+            ac2._configtracker.wait_finish(timeout=deadline - time.monotonic())
             return ac1, ac2
 
         def clone_online_account(self, account, pre_generated_key=True):
             self.live_count += 1
             tmpdb = tmpdir.join("livedb%d" % self.live_count)
             ac = self.make_account(tmpdb.strpath, logid="ac{}".format(self.live_count))
+            ac._configtracker = ac.add_account_plugin(ConfigureTracker())
             if pre_generated_key:
                 self._preconfigure_key(ac, account.get_config("addr"))
             ac._evtracker.init_time = self.init_time
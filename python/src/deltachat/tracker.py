@@ -1,6 +1,7 @@
 
-from queue import Queue
-from threading import Event
+import time
+from collections import deque
+from threading import Condition, Event, Lock
 
 from .hookspec import account_hookimpl
 
@@ -8,69 +9,155 @@ from .hookspec import account_hookimpl
 class ImexFailed(RuntimeError):
     """ Exception for signalling that import/export operations failed."""
 
+    def __init__(self, *args, files_written=None):
+        super().__init__(*args)
+        self.files_written = files_written
+
+    def __str__(self):
+        if self.files_written is None:
+            return super().__str__()
+        return "export failed, exp-files: {}".format(self.files_written)
+
 
 class ImexTracker:
     def __init__(self):
-        self._imex_events = Queue()
+        # progress values are not kept, the terminal value sets _done
+        self._lock = Lock()
+        self._last_event_time = float("-inf")
+        self._files_written = []
+        self._done = Event()
+        self._failed = False
+        self._handlers = {
+            "DC_EVENT_IMEX_PROGRESS": self._on_progress,
+            "DC_EVENT_IMEX_FILE_WRITTEN": self._on_file_written,
+        }
+        # bound once as it is used for every ffi event
+        self._get_handler = self._handlers.get
 
     @account_hookimpl
     def ac_process_ffi_event(self, ffi_event):
-        if ffi_event.name == "DC_EVENT_IMEX_PROGRESS":
-            self._imex_events.put(ffi_event.data1)
-        elif ffi_event.name == "DC_EVENT_IMEX_FILE_WRITTEN":
-            self._imex_events.put(ffi_event.data1)
+        handler = self._get_handler(ffi_event.name)
+        if handler is not None:
+            handler(ffi_event.data1)
+
+    def _on_progress(self, progress):
+        if self._done.is_set():
+            return
+        self._last_event_time = time.monotonic()
+        if progress == 0:
+            self._failed = True
+            self._done.set()
+        elif progress == 1000:
+            self._done.set()
+
+    def _on_file_written(self, path):
+        with self._lock:
+            self._files_written.append(path)
+        self._last_event_time = time.monotonic()
 
     def wait_finish(self, progress_timeout=60):
-        """ Return list of written files, raise ValueError if ExportFailed. """
-        files_written = []
-        while True:
-            ev = self._imex_events.get(timeout=progress_timeout)
-            if isinstance(ev, str):
-                files_written.append(ev)
-            elif ev == 0:
-                raise ImexFailed("export failed, exp-files: {}".format(files_written))
-            elif ev == 1000:
-                return files_written
+        """ Return list of written files, raise ImexFailed if ExportFailed.
+
+        Raise TimeoutError if no imex event was reported for
+        `progress_timeout` seconds.  With `progress_timeout=None`
+        wait until import/export finished, however long it takes.
+        """
+        if progress_timeout is None:
+            self._done.wait()
+        started = time.monotonic()
+        while not self._done.is_set():
+            last_event_time = max(started, self._last_event_time)
+            remaining = last_event_time + progress_timeout - time.monotonic()
+            if remaining <= 0:
+                raise TimeoutError("no imex progress for {} seconds".format(progress_timeout))
+            self._done.wait(remaining)
+        with self._lock:
+            files_written = list(self._files_written)
+        if self._failed:
+            raise ImexFailed(files_written=files_written)
+        return files_written
 
 
 class ConfigureFailed(RuntimeError):
     """ Exception for signalling that configuration failed."""
 
+    def __init__(self, *args, ffi_events=None):
+        super().__init__(*args)
+        self.ffi_events = ffi_events
+
+    def __str__(self):
+        if self.ffi_events is None:
+            return super().__str__()
+        return "\n".join(
+            "{} data1={} data2={}".format(*ev) for ev in self.ffi_events)
+
 
 class ConfigureTracker:
     ConfigureFailed = ConfigureFailed
 
+    # bits of the connection state
+    SMTP_CONNECTED = 1
+    IMAP_CONNECTED = 2
+
     def __init__(self):
-        self._configure_events = Queue()
-        self._smtp_finished = Event()
-        self._imap_finished = Event()
-        self._ffi_events = []
+        self._configure_done = Event()
+        self._configure_success = None
+        self._cond = Condition()
+        self._state = 0
+        # only the most recent events are needed for failure reports
+        self._ffi_events = deque(maxlen=256)
+        self._state_bits = {
+            "DC_EVENT_SMTP_CONNECTED": self.SMTP_CONNECTED,
+            "DC_EVENT_IMAP_CONNECTED": self.IMAP_CONNECTED,
+        }
+        # bound once as they are used for every ffi event
+        self._append = self._ffi_events.append
+        self._get_state_bit = self._state_bits.get
 
     @account_hookimpl
     def ac_process_ffi_event(self, ffi_event):
-        self._ffi_events.append(ffi_event)
-        if ffi_event.name == "DC_EVENT_SMTP_CONNECTED":
-            self._smtp_finished.set()
-        elif ffi_event.name == "DC_EVENT_IMAP_CONNECTED":
-            self._imap_finished.set()
+        name = ffi_event.name
+        self._append((name, ffi_event.data1, ffi_event.data2))
+        bit = self._get_state_bit(name)
+        if bit is not None:
+            with self._cond:
+                self._state |= bit
+                self._cond.notify_all()
 
     @account_hookimpl
     def ac_configure_completed(self, success):
-        self._configure_events.put(success)
+        self._configure_success = success
+        self._configure_done.set()
 
-    def wait_smtp_connected(self):
-        """ wait until smtp is configured. """
-        self._smtp_finished.wait()
+    def _wait_state(self, bit, timeout, what):
+        with self._cond:
+            if not self._cond.wait_for(lambda: self._state & bit, timeout):
+                raise TimeoutError("{} not connected within {} seconds".format(what, timeout))
 
-    def wait_imap_connected(self):
-        """ wait until smtp is configured. """
-        self._imap_finished.wait()
+    def wait_smtp_connected(self, timeout=None):
+        """ wait until smtp is configured.
 
-    def wait_finish(self):
+        Raise TimeoutError if smtp did not connect within `timeout` seconds.
+        """
+        self._wait_state(self.SMTP_CONNECTED, timeout, "smtp")
+
+    def wait_imap_connected(self, timeout=None):
+        """ wait until imap is configured.
+
+        Raise TimeoutError if imap did not connect within `timeout` seconds.
+        """
+        self._wait_state(self.IMAP_CONNECTED, timeout, "imap")
+
+    def wait_finish(self, timeout=None):
         """ wait until configure is completed.
 
-        Raise Exception if Configure failed
+        A tracker follows a single configure run: once completed,
+        further calls return (or raise) immediately with its outcome.
+
+        Raise Exception if Configure failed, raise TimeoutError if
+        configure did not complete within `timeout` seconds.
         """
-        if not self._configure_events.get():
-            content = "\n".join(map(str, self._ffi_events))
-            raise ConfigureFailed(content)
+        if not self._configure_done.wait(timeout):
+            raise TimeoutError("configure did not complete within {} seconds".format(timeout))
+        if not self._configure_success:
+            raise ConfigureFailed(ffi_events=list(self._ffi_events))
@@ -2,10 +2,13 @@ from __future__ import print_function
 import pytest
 import os
 import queue
+import threading
 import time
 from deltachat import const, Account
 from deltachat.message import Message
 from deltachat.hookspec import account_hookimpl
+from deltachat.eventlogger import FFIEvent
+from deltachat.tracker import ImexFailed, ImexTracker, ConfigureFailed, ConfigureTracker
 from datetime import datetime, timedelta
 from conftest import (wait_configuration_progress,
                       wait_securejoin_inviter_progress)
@@ -175,11 +178,8 @@ class TestOfflineChat:
         assert chat1 == chat2
         assert not (chat1 != chat2)
 
-        for ichat in ac1.get_chats():
-            if ichat.id == chat1.id:
-                break
-        else:
-            pytest.fail("could not find chat")
+        chats_by_id = {ichat.id: ichat for ichat in ac1.get_chats()}
+        assert chat1.id in chats_by_id, "could not find chat"
 
     def test_group_chat_creation(self, ac1):
         contact1 = ac1.create_contact("some1@hello.com", name="some1")
@@ -505,6 +505,95 @@ class TestOfflineChat:
         assert in_list[1][2] == contacts[3]
 
 
+class TestTrackers:
+    def test_imex_failed_str(self):
+        assert str(ImexFailed()) == ""
+        assert str(ImexFailed("boom")) == "boom"
+        exc = ImexFailed(files_written=["/x"])
+        assert exc.files_written == ["/x"]
+        assert str(exc) == "export failed, exp-files: ['/x']"
+
+    def test_configure_failed_str(self):
+        assert str(ConfigureFailed()) == ""
+        assert str(ConfigureFailed("boom")) == "boom"
+        exc = ConfigureFailed(ffi_events=[("DC_EVENT_ERROR", 0, "oops")])
+        assert str(exc) == "DC_EVENT_ERROR data1=0 data2=oops"
+
+    def test_imex_tracker_finished(self):
+        tracker = ImexTracker()
+        tracker.ac_process_ffi_event(FFIEvent("DC_EVENT_IMEX_PROGRESS", 500, 0))
+        tracker.ac_process_ffi_event(FFIEvent("DC_EVENT_IMEX_FILE_WRITTEN", "/x", 0))
+        tracker.ac_process_ffi_event(FFIEvent("DC_EVENT_INFO", 0, "other"))
+        tracker.ac_process_ffi_event(FFIEvent("DC_EVENT_IMEX_PROGRESS", 1000, 0))
+        assert tracker.wait_finish(progress_timeout=1) == ["/x"]
+
+    def test_imex_tracker_failed(self):
+        tracker = ImexTracker()
+        tracker.ac_process_ffi_event(FFIEvent("DC_EVENT_IMEX_FILE_WRITTEN", "/x", 0))
+        tracker.ac_process_ffi_event(FFIEvent("DC_EVENT_IMEX_PROGRESS", 0, 0))
+        with pytest.raises(ImexFailed) as excinfo:
+            tracker.wait_finish(progress_timeout=1)
+        assert excinfo.value.files_written == ["/x"]
+
+    def test_imex_tracker_finished_from_other_thread(self):
+        tracker = ImexTracker()
+
+        def produce():
+            for progress in range(1, 1001):
+                tracker.ac_process_ffi_event(FFIEvent("DC_EVENT_IMEX_PROGRESS", progress, 0))
+
+        threading.Thread(target=produce).start()
+        assert tracker.wait_finish(progress_timeout=5) == []
+
+    def test_imex_tracker_no_timeout(self):
+        tracker = ImexTracker()
+        timer = threading.Timer(0.2, tracker.ac_process_ffi_event,
+                                args=[FFIEvent("DC_EVENT_IMEX_PROGRESS", 1000, 0)])
+        timer.start()
+        assert tracker.wait_finish(progress_timeout=None) == []
+
+    def test_imex_tracker_timeout(self):
+        tracker = ImexTracker()
+        with pytest.raises(TimeoutError):
+            tracker.wait_finish(progress_timeout=0.1)
+
+    def test_imex_tracker_timeout_reset_by_events(self):
+        tracker = ImexTracker()
+        timer = threading.Timer(0.3, tracker.ac_process_ffi_event,
+                                args=[FFIEvent("DC_EVENT_IMEX_FILE_WRITTEN", "/x", 0)])
+        timer.start()
+        started = time.monotonic()
+        with pytest.raises(TimeoutError):
+            tracker.wait_finish(progress_timeout=0.5)
+        assert time.monotonic() - started >= 0.8
+
+    def test_configure_tracker_finished(self):
+        tracker = ConfigureTracker()
+        tracker.ac_process_ffi_event(FFIEvent("DC_EVENT_IMAP_CONNECTED", 0, 0))
+        tracker.ac_process_ffi_event(FFIEvent("DC_EVENT_SMTP_CONNECTED", 0, 0))
+        tracker.ac_configure_completed(success=True)
+        tracker.wait_imap_connected(timeout=1)
+        tracker.wait_smtp_connected(timeout=1)
+        tracker.wait_finish(timeout=1)
+
+    def test_configure_tracker_failed(self):
+        tracker = ConfigureTracker()
+        tracker.ac_process_ffi_event(FFIEvent("DC_EVENT_ERROR", 0, "oops"))
+        tracker.ac_configure_completed(success=False)
+        with pytest.raises(ConfigureFailed) as excinfo:
+            tracker.wait_finish(timeout=1)
+        assert "DC_EVENT_ERROR data1=0 data2=oops" in str(excinfo.value)
+
+    def test_configure_tracker_timeout(self):
+        tracker = ConfigureTracker()
+        with pytest.raises(TimeoutError):
+            tracker.wait_imap_connected(timeout=0.1)
+        with pytest.raises(TimeoutError):
+            tracker.wait_smtp_connected(timeout=0.1)
+        with pytest.raises(TimeoutError):
+            tracker.wait_finish(timeout=0.1)
+
+
 class TestOnlineAccount:
     def get_chat(self, ac1, ac2, both_created=False):
         c2 = ac1.create_contact(email=ac2.get_config("addr"))
@@ -514,6 +603,11 @@ class TestOnlineAccount:
             ac2.create_chat_by_contact(ac2.create_contact(email=ac1.get_config("addr")))
         return chat
 
+    @pytest.fixture
+    def online_pair(self, acfactory):
+        ac1, ac2 = acfactory.get_two_online_accounts()
+        return ac1, ac2, self.get_chat(ac1, ac2)
+
     def test_double_iter_events(self, acfactory):
         ac1 = acfactory.get_one_online_account()
         with pytest.raises(RuntimeError):
@@ -626,9 +720,8 @@ class TestOnlineAccount:
         ev_msg = ac1_clone._evtracker.wait_next_messages_changed()
         assert ev_msg.text == msg_out.text
 
-    def test_send_file_twice_unicode_filename_mangling(self, tmpdir, acfactory, lp):
-        ac1, ac2 = acfactory.get_two_online_accounts()
-        chat = self.get_chat(ac1, ac2)
+    def test_send_file_twice_unicode_filename_mangling(self, tmpdir, online_pair, lp):
+        ac1, ac2, chat = online_pair
 
         basename = "somedäüta.html.zip"
         p = os.path.join(tmpdir.strpath, basename)
@@ -658,9 +751,8 @@ class TestOnlineAccount:
         assert msg2.filename.endswith("html.zip")
         assert msg.filename != msg2.filename
 
-    def test_send_file_html_attachment(self, tmpdir, acfactory, lp):
-        ac1, ac2 = acfactory.get_two_online_accounts()
-        chat = self.get_chat(ac1, ac2)
+    def test_send_file_html_attachment(self, tmpdir, online_pair, lp):
+        ac1, ac2, chat = online_pair
 
         basename = "test.html"
         content = "<html><body>text</body>data"
@@ -733,9 +825,8 @@ class TestOnlineAccount:
         ac1._evtracker.get_matching("DC_EVENT_IMAP_MESSAGE_MOVED")
         ac1._evtracker.get_matching("DC_EVENT_IMAP_MESSAGE_MOVED")
 
-    def test_forward_messages(self, acfactory, lp):
-        ac1, ac2 = acfactory.get_two_online_accounts()
-        chat = self.get_chat(ac1, ac2)
+    def test_forward_messages(self, online_pair, lp):
+        ac1, ac2, chat = online_pair
 
         lp.sec("ac1: send message to ac2")
         msg_out = chat.send_text("message2")
@@ -906,11 +997,8 @@ class TestOnlineAccount:
         # MDN is received even though MDNs are already disabled
         assert msg_out.is_out_mdn_received()
 
-    def test_send_and_receive_will_encrypt_decrypt(self, acfactory, lp):
-        ac1, ac2 = acfactory.get_two_online_accounts()
-
-        lp.sec("ac1: create chat with ac2")
-        chat = self.get_chat(ac1, ac2)
+    def test_send_and_receive_will_encrypt_decrypt(self, acfactory, online_pair, lp):
+        ac1, ac2, chat = online_pair
 
         lp.sec("sending text message from ac1 to ac2")
         msg_out = chat.send_text("message1")
@@ -982,11 +1070,8 @@ class TestOnlineAccount:
         assert msg_in.text == text2
         assert ac1.get_config("addr") in msg_in.chat.get_name()
 
-    def test_reply_encrypted(self, acfactory, lp):
-        ac1, ac2 = acfactory.get_two_online_accounts()
-
-        lp.sec("ac1: create chat with ac2")
-        chat = self.get_chat(ac1, ac2)
+    def test_reply_encrypted(self, online_pair, lp):
+        ac1, ac2, chat = online_pair
 
         lp.sec("sending text message from ac1 to ac2")
         msg_out = chat.send_text("message1")
@@ -1054,9 +1139,8 @@ class TestOnlineAccount:
         assert mime.get_all("From")
         assert mime.get_all("Received")
 
-    def test_send_and_receive_image(self, acfactory, lp, data):
-        ac1, ac2 = acfactory.get_two_online_accounts()
-        chat = self.get_chat(ac1, ac2)
+    def test_send_and_receive_image(self, online_pair, lp, data):
+        ac1, ac2, chat = online_pair
 
         message_queue = queue.Queue()
 
@@ -1491,6 +1575,7 @@ class TestGroupStressTests:
 
         lp.sec("ac1: setting up contacts with 4 other members")
         contacts = []
+        ac1_addr = ac1.get_config("addr")
         for acc, name in zip(accounts, list("äöüsr")):
             contact = ac1.create_contact(acc.get_config("addr"), name=name)
             contacts.append(contact)
@@ -1499,7 +1584,7 @@ class TestGroupStressTests:
             ac1.create_chat_by_contact(contact)
 
             # make sure the other side accepts our messages
-            c1 = acc.create_contact(ac1.get_config("addr"), "ä member")
+            c1 = acc.create_contact(ac1_addr, "ä member")
             chat1 = acc.create_chat_by_contact(c1)
 
             # send a message to get the contact key via autocrypt header
@@ -1595,6 +1680,7 @@ class TestGroupStressTests:
 
         lp.sec("ac1: setting up contacts with 2 other members")
         contacts = []
+        ac1_addr = ac1.get_config("addr")
         for acc, name in zip(accounts, ["ac2", "ac3"]):
             contact = ac1.create_contact(acc.get_config("addr"), name=name)
             contacts.append(contact)
@@ -1603,7 +1689,7 @@ class TestGroupStressTests:
             ac1.create_chat_by_contact(contact)
 
             # make sure the other side accepts our messages
-            c1 = acc.create_contact(ac1.get_config("addr"), "a member")
+            c1 = acc.create_contact(ac1_addr, "a member")
             chat1 = acc.create_chat_by_contact(c1)
 
             # send a message to get the contact key via autocrypt header
@@ -2,6 +2,8 @@ import json
 import re
 from conftest import wait_configuration_progress
 
+_VAPID_RE = re.compile(r"-----BEGIN PUBLIC KEY-----\r?\n[A-Za-z0-9+/\r\n]+={,3}\r?\n-----END PUBLIC KEY-----")
+
 def test_webpush_capability(acfactory):
     ac = acfactory.get_online_configuring_account()
     wait_configuration_progress(ac, 1000)
@@ -13,7 +15,7 @@ def test_webpush_vapid_key(acfactory):
     wait_configuration_progress(ac, 1000)
 
     vapid = ac.get_webpush_vapid_key()
-    assert re.match(r"-----BEGIN PUBLIC KEY-----\r?\n[A-Za-z0-9+/\r\n]+={,3}\r?\n-----END PUBLIC KEY-----", vapid)
+    assert _VAPID_RE.match(vapid)
 
 def test_webpush_subscription(acfactory):
     ac = acfactory.get_online_configuring_account()